@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import gspread
 from google.oauth2.service_account import Credentials
 import json
-import altair as alt
 import time
 from datetime import datetime
 
@@ -14,9 +14,9 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
-# Festive Diwali Marquee Banner
-st.markdown(
-    """
+# Festive Diwali Marquee Banner (module-level constant: the block is built
+# once at import, not re-assembled per rerun)
+MARQUEE_HTML = """
     <style>
     .fixed-marquee {
         position: fixed;
@@ -50,31 +50,311 @@ st.markdown(
         For all queries in regards to Hotel Automation, pls contact us on +91-9167584555, or mail us on info@netcreatorsautomation.in
       </div>
     </div>
-    """,
-    unsafe_allow_html=True
-)
+    """
 
-# Authenticate with Google Sheets
-service_account_info = st.secrets["gcp_service_account"]
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
-client = gspread.authorize(creds)
+st.markdown(MARQUEE_HTML, unsafe_allow_html=True)
 
-# Load data from Google Sheets
+# Google Sheets access
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 SHEET_ID = "1polqqd0z2BJKZc_P9m6IQ-IOpCCRi-m0HHANCLweRrM"
-spreadsheet = client.open_by_key(SHEET_ID)
+
+@st.cache_resource
+def get_spreadsheet():
+    # Authenticate once per session: open_by_key issues a spreadsheets.get
+    # call, which we don't want on every rerun
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"], scopes=SCOPES
+    )
+    return gspread.authorize(creds).open_by_key(SHEET_ID)
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_transactions():
-    transactions_sheet = spreadsheet.worksheet("Transactions")
-    data = transactions_sheet.get_all_records()
-    return pd.DataFrame(data)
+def load_sheets():
+    # One batchGet for both worksheets instead of two round-trips + get_all_records
+    result = get_spreadsheet().values_batch_get(["Transactions!A:Z", "CurrentBalances!A:Z"])
+    frames = []
+    for value_range in result["valueRanges"]:
+        rows = value_range.get("values", [])
+        frames.append(pd.DataFrame(rows[1:], columns=rows[0]) if rows else pd.DataFrame())
+    df_transactions, df_balances = frames
+    if "amount" in df_transactions.columns:
+        df_transactions["amount"] = pd.to_numeric(df_transactions["amount"], errors="coerce")
+    # Low-cardinality string columns: category dtype makes isin/groupby/value_counts
+    # run on integer codes instead of per-row string comparisons
+    if "userName" in df_transactions.columns:
+        df_transactions["userName"] = df_transactions["userName"].astype("category")
+    if "type" in df_transactions.columns:
+        df_transactions["type"] = df_transactions["type"].astype("category")
+    if "Current Balance" in df_balances.columns:
+        df_balances["Current Balance"] = pd.to_numeric(df_balances["Current Balance"], errors="coerce")
+    # Phone columns stay text; cast once here (Arrow-backed strings) instead
+    # of re-allocating an object column on every rerun
+    if "phoneNumber" in df_transactions.columns:
+        df_transactions["phoneNumber"] = df_transactions["phoneNumber"].astype("string[pyarrow]")
+    if "Phone" in df_balances.columns:
+        df_balances["Phone"] = df_balances["Phone"].astype("string[pyarrow]")
+    if "Timestamp" in df_transactions.columns:
+        df_transactions["Timestamp"] = pd.to_datetime(
+            df_transactions["Timestamp"],
+            format="%d/%m/%Y %H:%M:%S",
+            cache=True,
+            errors="coerce"
+        )
+        # Day-floored copy kept as datetime64 so the daily rollup doesn't
+        # allocate Python date objects via .dt.date every rerun
+        df_transactions["TsDay"] = df_transactions["Timestamp"].values.astype("datetime64[D]")
+    return df_transactions, df_balances
+
+
+@st.cache_data(ttl=300)
+def filter_transactions(users_key, types_key, date_key):
+    df_transactions, _ = load_sheets()
+    mask = np.ones(len(df_transactions), dtype=bool)
+    if users_key:
+        mask &= df_transactions["userName"].isin(users_key).to_numpy()
+    mask &= df_transactions["type"].isin(types_key).to_numpy()
+    if date_key:
+        ts = df_transactions["Timestamp"].to_numpy()
+        start64 = np.datetime64(date_key[0])
+        end64 = np.datetime64(date_key[1]) + np.timedelta64(1, "D")
+        mask &= (ts >= start64) & (ts < end64)
+    return df_transactions.loc[mask]
+
+
+# Aggregations keyed on the filter selections: repeat interactions with the
+# same filters skip the pandas work entirely.
+
+@st.cache_data(ttl=300)
+def type_counts_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    # observed=True: value_counts on a categorical would emit zero rows for
+    # categories removed by the sidebar filter
+    return df.groupby("type", observed=True).size().reset_index(name="count")
+
+
+@st.cache_data(ttl=300)
+def type_summary_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    return df.groupby("type", observed=True)["amount"].sum().reset_index()
+
+
+@st.cache_data(ttl=300)
+def daily_transactions_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    daily = df.groupby("TsDay", observed=True)["amount"].sum().reset_index()
+    daily.columns = ["Date", "Total Amount"]
+    return daily
+
+
+@st.cache_data(ttl=300)
+def user_activity_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    return df.groupby("userName", observed=True).size().reset_index(name="transaction_count")
+
+
+@st.cache_data(ttl=300)
+def top_balances_agg(users_key):
+    _, df_balances = load_sheets()
+    if users_key:
+        df_balances = df_balances[df_balances["Username"].isin(users_key)]
+    return df_balances.nlargest(5, "Current Balance")
+
+
+# Histograms are binned server-side so only ~20 rows of bin edges and counts
+# reach the browser instead of the full dataset embedded in the chart payload
+
+@st.cache_data(ttl=300)
+def balance_histogram_agg(users_key):
+    _, df_balances = load_sheets()
+    if users_key:
+        df_balances = df_balances[df_balances["Username"].isin(users_key)]
+    values = df_balances["Current Balance"].dropna().to_numpy()
+    if values.size == 0:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "count"])
+    counts, edges = np.histogram(values, bins=20)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+@st.cache_data(ttl=300)
+def amount_histogram_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    amounts = df["amount"].dropna()
+    if amounts.empty:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "type", "count"])
+    edges = np.histogram_bin_edges(amounts.to_numpy(), bins=20)
+    binned = pd.cut(df["amount"], bins=edges, include_lowest=True)
+    counts = df.groupby([binned, "type"], observed=True).size().reset_index(name="count")
+    intervals = pd.IntervalIndex(counts["amount"])
+    counts["bin_start"] = intervals.left.astype(float)
+    counts["bin_end"] = intervals.right.astype(float)
+    return counts[["bin_start", "bin_end", "type", "count"]]
+
+
+@st.cache_data(ttl=300)
+def balance_by_user():
+    # Username-indexed balances built once, so per-filter lookups below are
+    # plain index joins rather than repeated set_index calls
+    _, df_balances = load_sheets()
+    return df_balances.set_index("Username")[["Current Balance"]]
+
 
 @st.cache_data(ttl=300)
-def load_balances():
-    balance_sheet = spreadsheet.worksheet("CurrentBalances")
-    data = balance_sheet.get_all_records()
-    return pd.DataFrame(data)
+def user_performance_agg(users_key, types_key, date_key):
+    df = filter_transactions(users_key, types_key, date_key)
+    user_summary = df.groupby("userName", observed=True)["amount"].agg(
+        total_amount="sum", transaction_count="count"
+    ).reset_index()
+    return user_summary.join(balance_by_user(), on="userName")
+
+
+# Vega-Lite specs as plain dicts: only the data changes between reruns, so
+# building the spec through Altair's class graph + schema validation every
+# rerun is wasted work. st.vega_lite_chart takes these as-is.
+
+BALANCE_PIE_SPEC = {
+    "title": "Balance Distribution",
+    "height": 300,
+    "mark": {"type": "arc", "innerRadius": 50},
+    "encoding": {
+        "theta": {"field": "Current Balance", "type": "quantitative"},
+        "color": {"field": "Username", "type": "nominal", "legend": None},
+        "tooltip": [
+            {"field": "Username", "type": "nominal"},
+            {"field": "Current Balance", "type": "quantitative"},
+        ],
+    },
+}
+
+TYPE_PIE_SPEC = {
+    "title": "Transaction Types",
+    "height": 300,
+    "mark": {"type": "arc"},
+    "encoding": {
+        "theta": {"field": "count", "type": "quantitative"},
+        "color": {"field": "type", "type": "nominal"},
+        "tooltip": [
+            {"field": "type", "type": "nominal"},
+            {"field": "count", "type": "quantitative"},
+        ],
+    },
+}
+
+TYPE_BAR_SPEC = {
+    "title": "Total Amount per Transaction Type",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "type", "type": "nominal", "title": "Transaction Type", "sort": "-y"},
+        "y": {"field": "amount", "type": "quantitative", "title": "Total Amount (₹)"},
+        "color": {"field": "type", "type": "nominal", "legend": None},
+        "tooltip": [
+            {"field": "type", "type": "nominal"},
+            {"field": "amount", "type": "quantitative"},
+        ],
+    },
+}
+
+TIMELINE_SPEC = {
+    "title": "Daily Transaction Trends",
+    "height": 300,
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": {"field": "Date", "type": "temporal", "title": "Date"},
+        "y": {"field": "Total Amount", "type": "quantitative", "title": "Daily Total (₹)"},
+        "tooltip": [
+            {"field": "Date", "type": "temporal"},
+            {"field": "Total Amount", "type": "quantitative"},
+        ],
+    },
+}
+
+USER_ACTIVITY_SPEC = {
+    "title": "User Transaction Activity",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "userName", "type": "nominal", "title": "User", "sort": "-y"},
+        "y": {"field": "transaction_count", "type": "quantitative", "title": "Number of Transactions"},
+        "color": {"field": "userName", "type": "nominal", "legend": None},
+        "tooltip": [
+            {"field": "userName", "type": "nominal"},
+            {"field": "transaction_count", "type": "quantitative"},
+        ],
+    },
+}
+
+USER_BALANCE_SPEC = {
+    "title": "Current Balances by User",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "Username", "type": "nominal", "title": "User", "sort": "-y"},
+        "y": {"field": "Current Balance", "type": "quantitative", "title": "Current Balance (₹)"},
+        "color": {"field": "Current Balance", "type": "quantitative", "scale": {"scheme": "greens"}},
+        "tooltip": [
+            {"field": "Username", "type": "nominal"},
+            {"field": "Current Balance", "type": "quantitative"},
+        ],
+    },
+}
+
+BALANCE_HIST_SPEC = {
+    "title": "Balance Distribution",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "bin_start", "type": "quantitative", "bin": {"binned": True}, "title": "Balance Range"},
+        "x2": {"field": "bin_end"},
+        "y": {"field": "count", "type": "quantitative", "title": "Number of Users"},
+        "color": {"field": "bin_start", "type": "quantitative", "scale": {"scheme": "blues"}},
+        "tooltip": [{"field": "count", "type": "quantitative"}],
+    },
+}
+
+TOP_USERS_SPEC = {
+    "title": "Top 5 Users by Balance",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "Current Balance", "type": "quantitative", "title": "Balance (₹)"},
+        "y": {"field": "Username", "type": "nominal", "title": "User", "sort": "-x"},
+        "color": {"field": "Current Balance", "type": "quantitative", "scale": {"scheme": "viridis"}},
+        "tooltip": [
+            {"field": "Username", "type": "nominal"},
+            {"field": "Current Balance", "type": "quantitative"},
+        ],
+    },
+}
+
+AMOUNT_HIST_SPEC = {
+    "title": "Transaction Amount Distribution",
+    "height": 300,
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "bin_start", "type": "quantitative", "bin": {"binned": True}, "title": "Transaction Amount"},
+        "x2": {"field": "bin_end"},
+        "y": {"field": "count", "type": "quantitative", "title": "Frequency"},
+        "color": {"field": "type", "type": "nominal", "title": "Transaction Type"},
+        "tooltip": [{"field": "count", "type": "quantitative"}, {"field": "type", "type": "nominal"}],
+    },
+}
+
+SCATTER_SPEC = {
+    "title": "User Performance: Transactions vs Total Amount",
+    "height": 300,
+    "mark": {"type": "circle", "size": 100},
+    "encoding": {
+        "x": {"field": "transaction_count", "type": "quantitative", "title": "Number of Transactions"},
+        "y": {"field": "total_amount", "type": "quantitative", "title": "Total Transaction Amount (₹)"},
+        "size": {"field": "Current Balance", "type": "quantitative", "title": "Current Balance"},
+        "color": {"field": "userName", "type": "nominal", "title": "User"},
+        "tooltip": [
+            {"field": "userName", "type": "nominal"},
+            {"field": "transaction_count", "type": "quantitative"},
+            {"field": "total_amount", "type": "quantitative"},
+            {"field": "Current Balance", "type": "quantitative"},
+        ],
+    },
+}
 
 # Header
 st.header("Netcreators Automation Dashboard", divider="gray")
@@ -87,13 +367,9 @@ with col2:
         st.rerun()
 
 # Load Data
-df_transactions = load_transactions()
-df_balances = load_balances()
+df_transactions, df_balances = load_sheets()
 
 # Convert date columns
-if "Timestamp" in df_transactions.columns:
-    df_transactions["Timestamp"] = pd.to_datetime(df_transactions["Timestamp"])
-
 if "Last Updated" in df_balances.columns:
    df_balances["Last Updated"] = pd.to_datetime(
     df_balances["Last Updated"],
@@ -105,43 +381,40 @@ if "Last Updated" in df_balances.columns:
 # Sidebar Filters
 st.sidebar.header("Filters")
 
-# User selection
-users = df_transactions["userName"].unique()
+# User selection (category dtype: read the interned categories instead of a
+# full-column unique() hash pass)
+users = df_transactions["userName"].cat.categories.to_numpy()
 selected_users = st.sidebar.multiselect("Select Users", users, default=users)
 
 # Transaction type selection
-types = df_transactions["type"].unique()
+types = df_transactions["type"].cat.categories.to_numpy()
 selected_type = st.sidebar.multiselect("Select Transaction Type", types, default=types)
 
 # Date range
 date_range = st.sidebar.date_input("Select Date Range", [])
 
+# Hashable cache keys derived from the filter selections
+users_key = tuple(sorted(selected_users))
+types_key = tuple(sorted(selected_type))
+date_key = tuple(date_range) if len(date_range) == 2 else None
+
 # Apply Filters
+df_transactions = filter_transactions(users_key, types_key, date_key)
+
 if selected_users:
-    df_transactions = df_transactions[df_transactions["userName"].isin(selected_users)]
     df_balances = df_balances[df_balances["Username"].isin(selected_users)]
 
-df_transactions = df_transactions[df_transactions["type"].isin(selected_type)]
-
-if len(date_range) == 2:
-    start_date, end_date = date_range
-    df_transactions = df_transactions[
-        (df_transactions["Timestamp"] >= pd.to_datetime(start_date)) & 
-        (df_transactions["Timestamp"] <= pd.to_datetime(end_date))
-    ]
-
-# Fix data types
-df_transactions["phoneNumber"] = df_transactions["phoneNumber"].astype(str)
-df_balances["Phone"] = df_balances["Phone"].astype(str)
-
 # Dashboard Metrics
 st.subheader("📈 Key Metrics")
 
-# Calculate metrics
+# Calculate metrics (single pass over the balance column)
+balance_stats = df_balances["Current Balance"].agg(["sum", "mean"])
+total_balance = balance_stats["sum"]
+avg_balance = balance_stats["mean"]
 total_users = len(df_balances)
-total_balance = df_balances["Current Balance"].sum()
 total_transactions = len(df_transactions)
-avg_balance = df_balances["Current Balance"].mean()
+active_users = int(np.count_nonzero(df_balances["Current Balance"].to_numpy() > 0))
+positive_transactions = int(np.count_nonzero(df_transactions["amount"].to_numpy() > 0))
 
 # Display metrics in columns
 metric1, metric2, metric3, metric4 = st.columns(4)
@@ -150,7 +423,7 @@ with metric1:
     st.metric(
         label="Total Users", 
         value=total_users,
-        delta=f"{len(df_balances[df_balances['Current Balance'] > 0])} active"
+        delta=f"{active_users} active"
     )
 
 with metric2:
@@ -167,7 +440,6 @@ with metric3:
     )
 
 with metric4:
-    positive_transactions = len(df_transactions[df_transactions["amount"] > 0])
     st.metric(
         label="Positive Transactions", 
         value=positive_transactions,
@@ -184,27 +456,23 @@ with balance_col1:
     # Sort by balance
     df_balances_sorted = df_balances.sort_values("Current Balance", ascending=False)
     
-    # Style the balances table
+    # Progress-bar column instead of a Styler gradient: the visual is drawn
+    # in the frontend, with no server-side per-cell HTML generation
     st.dataframe(
-        df_balances_sorted.style.format({
-            "Current Balance": "₹{:.0f}",
-            "Phone": lambda x: str(x)
-        }).background_gradient(subset=["Current Balance"], cmap="Greens"),
-        use_container_width=True
+        df_balances_sorted,
+        use_container_width=True,
+        column_config={
+            "Current Balance": st.column_config.ProgressColumn(
+                format="₹%d",
+                min_value=0,
+                max_value=float(df_balances["Current Balance"].max())
+            )
+        }
     )
 
 with balance_col2:
     # Balance distribution pie chart
-    balance_pie = alt.Chart(df_balances).mark_arc(innerRadius=50).encode(
-        theta=alt.Theta(field="Current Balance", type="quantitative"),
-        color=alt.Color(field="Username", type="nominal", legend=None),
-        tooltip=["Username", "Current Balance"]
-    ).properties(
-        title="Balance Distribution",
-        height=300
-    )
-    
-    st.altair_chart(balance_pie, use_container_width=True)
+    st.vega_lite_chart(df_balances, BALANCE_PIE_SPEC, use_container_width=True)
 
 # Transactions Section
 st.subheader("📋 Transaction History")
@@ -214,170 +482,98 @@ transaction_col1, transaction_col2 = st.columns([3, 1])
 
 with transaction_col1:
     st.dataframe(
-        df_transactions.style.format({
-            "amount": "₹{:.0f}",
-            "phoneNumber": lambda x: str(x)
-        }),
-        use_container_width=True
+        df_transactions.drop(columns=["TsDay"], errors="ignore"),
+        use_container_width=True,
+        column_config={
+            "amount": st.column_config.NumberColumn(format="₹%d")
+        }
     )
 
 with transaction_col2:
     # Transaction type distribution
-    type_counts = df_transactions["type"].value_counts().reset_index()
-    type_counts.columns = ["type", "count"]
-    
-    type_pie = alt.Chart(type_counts).mark_arc().encode(
-        theta=alt.Theta(field="count", type="quantitative"),
-        color=alt.Color(field="type", type="nominal"),
-        tooltip=["type", "count"]
-    ).properties(
-        title="Transaction Types",
-        height=300
-    )
-    
-    st.altair_chart(type_pie, use_container_width=True)
+    type_counts = type_counts_agg(users_key, types_key, date_key)
+    st.vega_lite_chart(type_counts, TYPE_PIE_SPEC, use_container_width=True)
 
 # Charts Section
 st.subheader("📊 Analytics & Insights")
 
-# Create tabs for different charts
-tab1, tab2, tab3, tab4 = st.tabs(["Transaction Analysis", "User Activity", "Balance Trends", "Performance Metrics"])
+# Each tab is a fragment so an interaction inside one tab reruns only that
+# tab's charts, not the whole script body
 
-with tab1:
+@st.fragment
+def render_tab1(df_transactions, users_key, types_key, date_key):
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Bar Chart for Transaction Types
-        type_summary = df_transactions.groupby("type")["amount"].sum().reset_index()
-        bar_chart = alt.Chart(type_summary).mark_bar().encode(
-            x=alt.X("type", title="Transaction Type", sort="-y"),
-            y=alt.Y("amount", title="Total Amount (₹)"),
-            color=alt.Color("type", legend=None),
-            tooltip=["type", "amount"]
-        ).properties(
-            title="Total Amount per Transaction Type",
-            height=300
-        )
-        st.altair_chart(bar_chart, use_container_width=True)
-    
+        type_summary = type_summary_agg(users_key, types_key, date_key)
+        st.vega_lite_chart(type_summary, TYPE_BAR_SPEC, use_container_width=True)
+
     with col2:
         # Transaction timeline
         if "Timestamp" in df_transactions.columns:
-            daily_transactions = df_transactions.groupby(
-                df_transactions["Timestamp"].dt.date
-            )["amount"].sum().reset_index()
-            daily_transactions.columns = ["Date", "Total Amount"]
-            
-            timeline_chart = alt.Chart(daily_transactions).mark_line(point=True).encode(
-                x=alt.X("Date:T", title="Date"),
-                y=alt.Y("Total Amount:Q", title="Daily Total (₹)"),
-                tooltip=["Date", "Total Amount"]
-            ).properties(
-                title="Daily Transaction Trends",
-                height=300
-            )
-            st.altair_chart(timeline_chart, use_container_width=True)
+            daily_transactions = daily_transactions_agg(users_key, types_key, date_key)
+            st.vega_lite_chart(daily_transactions, TIMELINE_SPEC, use_container_width=True)
 
-with tab2:
+
+@st.fragment
+def render_tab2(df_balances, users_key, types_key, date_key):
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # User transaction count
-        user_activity = df_transactions["userName"].value_counts().reset_index()
-        user_activity.columns = ["userName", "transaction_count"]
-        
-        activity_chart = alt.Chart(user_activity).mark_bar().encode(
-            x=alt.X("userName", title="User", sort="-y"),
-            y=alt.Y("transaction_count", title="Number of Transactions"),
-            color=alt.Color("userName", legend=None),
-            tooltip=["userName", "transaction_count"]
-        ).properties(
-            title="User Transaction Activity",
-            height=300
-        )
-        st.altair_chart(activity_chart, use_container_width=True)
-    
+        user_activity = user_activity_agg(users_key, types_key, date_key)
+        st.vega_lite_chart(user_activity, USER_ACTIVITY_SPEC, use_container_width=True)
+
     with col2:
         # User balance comparison
-        balance_chart = alt.Chart(df_balances).mark_bar().encode(
-            x=alt.X("Username", title="User", sort="-y"),
-            y=alt.Y("Current Balance", title="Current Balance (₹)"),
-            color=alt.Color("Current Balance", scale=alt.Scale(scheme="greens")),
-            tooltip=["Username", "Current Balance"]
-        ).properties(
-            title="Current Balances by User",
-            height=300
-        )
-        st.altair_chart(balance_chart, use_container_width=True)
+        st.vega_lite_chart(df_balances, USER_BALANCE_SPEC, use_container_width=True)
 
-with tab3:
+
+@st.fragment
+def render_tab3(users_key):
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Balance distribution histogram
-        hist_chart = alt.Chart(df_balances).mark_bar().encode(
-            x=alt.X("Current Balance:Q", bin=alt.Bin(maxbins=20), title="Balance Range"),
-            y=alt.Y("count()", title="Number of Users"),
-            color=alt.Color("Current Balance:Q", scale=alt.Scale(scheme="blues")),
-            tooltip=["count()"]
-        ).properties(
-            title="Balance Distribution",
-            height=300
-        )
-        st.altair_chart(hist_chart, use_container_width=True)
-    
+        balance_hist = balance_histogram_agg(users_key)
+        st.vega_lite_chart(balance_hist, BALANCE_HIST_SPEC, use_container_width=True)
+
     with col2:
         # Top users by balance
-        top_users = df_balances.nlargest(5, "Current Balance")
-        top_chart = alt.Chart(top_users).mark_bar().encode(
-            x=alt.X("Current Balance:Q", title="Balance (₹)"),
-            y=alt.Y("Username:N", title="User", sort="-x"),
-            color=alt.Color("Current Balance:Q", scale=alt.Scale(scheme="viridis")),
-            tooltip=["Username", "Current Balance"]
-        ).properties(
-            title="Top 5 Users by Balance",
-            height=300
-        )
-        st.altair_chart(top_chart, use_container_width=True)
+        top_users = top_balances_agg(users_key)
+        st.vega_lite_chart(top_users, TOP_USERS_SPEC, use_container_width=True)
 
-with tab4:
+
+@st.fragment
+def render_tab4(users_key, types_key, date_key):
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Transaction amount distribution
-        amount_hist = alt.Chart(df_transactions).mark_bar().encode(
-            x=alt.X("amount:Q", bin=alt.Bin(maxbins=20), title="Transaction Amount"),
-            y=alt.Y("count()", title="Frequency"),
-            color=alt.Color("type:N", title="Transaction Type"),
-            tooltip=["count()", "type"]
-        ).properties(
-            title="Transaction Amount Distribution",
-            height=300
-        )
-        st.altair_chart(amount_hist, use_container_width=True)
-    
+        amount_hist = amount_histogram_agg(users_key, types_key, date_key)
+        st.vega_lite_chart(amount_hist, AMOUNT_HIST_SPEC, use_container_width=True)
+
     with col2:
         # User performance scatter plot
-        user_summary = df_transactions.groupby("userName").agg({
-            "amount": ["sum", "count"],
-            "type": "first"
-        }).reset_index()
-        user_summary.columns = ["userName", "total_amount", "transaction_count", "first_type"]
-        
-        # Merge with balances
-        user_performance = pd.merge(user_summary, df_balances, left_on="userName", right_on="Username", how="left")
-        
-        scatter_chart = alt.Chart(user_performance).mark_circle(size=100).encode(
-            x=alt.X("transaction_count:Q", title="Number of Transactions"),
-            y=alt.Y("total_amount:Q", title="Total Transaction Amount (₹)"),
-            size=alt.Size("Current Balance:Q", title="Current Balance"),
-            color=alt.Color("userName:N", title="User"),
-            tooltip=["userName", "transaction_count", "total_amount", "Current Balance"]
-        ).properties(
-            title="User Performance: Transactions vs Total Amount",
-            height=300
-        )
-        st.altair_chart(scatter_chart, use_container_width=True)
+        user_performance = user_performance_agg(users_key, types_key, date_key)
+        st.vega_lite_chart(user_performance, SCATTER_SPEC, use_container_width=True)
+
+
+# Create tabs for different charts
+tab1, tab2, tab3, tab4 = st.tabs(["Transaction Analysis", "User Activity", "Balance Trends", "Performance Metrics"])
+
+with tab1:
+    render_tab1(df_transactions, users_key, types_key, date_key)
+
+with tab2:
+    render_tab2(df_balances, users_key, types_key, date_key)
+
+with tab3:
+    render_tab3(users_key)
+
+with tab4:
+    render_tab4(users_key, types_key, date_key)
 
 # Footer
 st.markdown("---")